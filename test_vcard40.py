@@ -2,25 +2,25 @@
 """Test script for vCard 4.0 implementation"""
 
 import sys
-import os
-
-# Add the vobject directory to the path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'vobject'))
 
 import vobject
 from vobject import vcard40
 
+vCard = vobject.vCard
+Name = vobject.vcard.Name
+VCard4_0 = vcard40.VCard4_0
+
 
 def test_basic_vcard40():
     """Test creating a basic vCard 4.0"""
     print("Test 1: Creating a basic vCard 4.0...")
 
     # Create a new vCard 4.0
-    v = vobject.vCard()
-    v.behavior = vcard40.VCard4_0
+    v = vCard()
+    v.behavior = VCard4_0
     v.add('fn').value = 'John Doe'
     v.add('n')
-    v.n.value = vobject.vcard.Name(family='Doe', given='John')
+    v.n.value = Name(family='Doe', given='John')
 
     # Add vCard 4.0 VERSION
     if hasattr(v, 'version'):
@@ -35,8 +35,8 @@ def test_new_properties():
     """Test vCard 4.0 new properties"""
     print("Test 2: Testing new vCard 4.0 properties...")
 
-    v = vobject.vCard()
-    v.behavior = vcard40.VCard4_0
+    v = vCard()
+    v.behavior = VCard4_0
 
     # Required properties
     v.add('fn').value = 'Jane Smith'
@@ -76,8 +76,8 @@ def test_modified_properties():
     """Test modified properties in vCard 4.0"""
     print("Test 3: Testing modified vCard 4.0 properties...")
 
-    v = vobject.vCard()
-    v.behavior = vcard40.VCard4_0
+    v = vCard()
+    v.behavior = VCard4_0
 
     # Required properties
     v.add('fn').value = 'Bob Johnson'
@@ -106,8 +106,8 @@ def test_group_vcard():
     """Test vCard 4.0 group with MEMBER property"""
     print("Test 4: Testing vCard 4.0 group...")
 
-    v = vobject.vCard()
-    v.behavior = vcard40.VCard4_0
+    v = vCard()
+    v.behavior = VCard4_0
 
     # Required properties
     v.add('fn').value = 'Development Team'
@@ -129,8 +129,8 @@ def test_multiple_fn():
     """Test multiple FN values (allowed in vCard 4.0)"""
     print("Test 5: Testing multiple FN values...")
 
-    v = vobject.vCard()
-    v.behavior = vcard40.VCard4_0
+    v = vCard()
+    v.behavior = VCard4_0
 
     # Multiple FN values with different languages
     v.add('version').value = '4.0'
@@ -151,8 +151,8 @@ def test_new_parameters():
     """Test new vCard 4.0 parameters"""
     print("Test 6: Testing new vCard 4.0 parameters...")
 
-    v = vobject.vCard()
-    v.behavior = vcard40.VCard4_0
+    v = vCard()
+    v.behavior = VCard4_0
 
     v.add('version').value = '4.0'
     v.add('fn').value = 'Alice Williams'
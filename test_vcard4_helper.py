@@ -3,18 +3,22 @@
 
 import vobject
 
+vCard = vobject.vCard
+vCard4 = vobject.vCard4
+Name = vobject.vcard.Name
+
 
 def test_vcard4_helper():
     """Test that vCard4() creates a vCard 4.0 object"""
     print("Testing vCard4() helper function...")
 
     # Create a vCard 4.0 using the helper
-    v = vobject.vCard4()
+    v = vCard4()
 
     # Add some content
     v.add('fn').value = 'Test Person'
     v.add('n')
-    v.n.value = vobject.vcard.Name(family='Person', given='Test')
+    v.n.value = Name(family='Person', given='Test')
 
     # Add vCard 4.0 specific properties
     v.add('kind').value = 'individual'
@@ -42,14 +46,14 @@ def test_comparison():
     print("=" * 60)
 
     # vCard 3.0
-    v3 = vobject.vCard()
+    v3 = vCard()
     v3.add('fn').value = 'John Doe'
     print("\nvCard 3.0:")
     print(v3.serialize())
     assert v3.version.value == '3.0'
 
     # vCard 4.0
-    v4 = vobject.vCard4()
+    v4 = vCard4()
     v4.add('fn').value = 'John Doe'
     print("\nvCard 4.0:")
     print(v4.serialize())
@@ -1,5 +1,7 @@
 import datetime
 
+import pytest
+
 import vobject
 
 
@@ -64,3 +66,55 @@ def test_period_behavior():
 
     line.value.append((datetime.datetime(2006, 5, 16, 10), two_hours))
     assert line.serialize().strip() == "TEST:20060216T100000/PT2H,20060516T100000/PT2H"
+
+
+def test_register_behaviors():
+    """
+    Bulk registration appends, leaving existing defaults alone.
+    """
+    getBehavior = vobject.base.getBehavior
+    assert getBehavior("VCARD") is vobject.vcard.VCard3_0
+    assert getBehavior("VCARD", "4.0") is vobject.vcard40.VCard4_0
+    assert getBehavior("PHOTO") is vobject.vcard.Photo
+    assert getBehavior("PHOTO", "4.0") is vobject.vcard40.Photo4_0
+    assert getBehavior("KIND") is vobject.vcard40.Kind
+
+
+def test_child_count_validation():
+    """
+    knownChildren minimums and maximums are enforced
+    """
+    card = vobject.vCard4()
+    assert not card.validate()
+    with pytest.raises(vobject.base.ValidateError, match="must contain at least 1 VERSION"):
+        card.validate(raiseException=True)
+
+    card.add("version").value = "4.0"
+    with pytest.raises(vobject.base.ValidateError, match="must contain at least 1 FN"):
+        card.validate(raiseException=True)
+
+    card.add("fn").value = "Jane Doe"
+    card.add("gender").value = "F"
+    assert card.validate()
+
+    card.add("gender").value = "F"
+    with pytest.raises(vobject.base.ValidateError, match="cannot contain more than 1 GENDER"):
+        card.validate(raiseException=True)
+
+
+def test_child_count_validation_mutable_table():
+    """
+    In-place edits to a mutable knownChildren table are honored
+    """
+    card = vobject.vCard()
+    card.add("fn").value = "Jane Doe"
+    card.add("version").value = "3.0"
+    assert card.validate()
+
+    knownChildren = vobject.vcard.VCard3_0.knownChildren
+    knownChildren["X-REQ"] = (1, None, None)
+    try:
+        assert not card.validate()
+    finally:
+        del knownChildren["X-REQ"]
+    assert card.validate()
@@ -88,3 +88,83 @@ def test_vcard_3_parsing():
         new_card = vobject.base.readOne(card.serialize())
         assert new_card.org.value == card.org.value
         card = new_card
+
+
+def test_vcard_4_gender():
+    """
+    GENDER keeps both components, unescaping only when needed
+    """
+    for raw, decoded in (("F", "F"), ("F;female", "F;female"), ("O;a\\;b", "O;a;b"), ("M;x,y", "M;x")):
+        card = vobject.readOne(f"BEGIN:VCARD\r\nVERSION:4.0\r\nFN:A\r\nGENDER:{raw}\r\nEND:VCARD\r\n")
+        assert card.gender.behavior is vobject.vcard40.Gender
+        assert card.gender.value == decoded
+
+
+def test_vcard_4_photo_serialize():
+    """
+    vCard 4.0 PHOTO and LOGO return their (unwrapped) serialization
+    """
+    for behavior in (vobject.vcard40.Photo4_0, vobject.vcard40.Logo4_0):
+        line = vobject.base.ContentLine(behavior.name, [], "http://example.com/" + "a" * 100)
+        line.behavior = behavior
+        assert line.serialize() == f"{behavior.name.upper()}:http://example.com/{'a' * 100}\r\n"
+
+
+def test_vcard_4_media_repr():
+    """
+    vCard 4.0 media properties show the value's address in hex
+    """
+    line = vobject.base.ContentLine("SOUND", [], "http://example.com/sound.ogg")
+    line.behavior = vobject.vcard40.Sound4_0
+    assert str(line) == f"<SOUND{{}} (SOUND URI at 0x{id(line.value):x}) >"
+
+
+def test_vcard_4_implicit_version():
+    """
+    Generated vCard 4.0 VERSION lines are independent of each other
+    """
+    first, second = vobject.vCard4(), vobject.vCard4()
+    for card in (first, second):
+        card.add("fn").value = "Jane Doe"
+        assert "VERSION:4.0" in card.serialize()
+    assert first.version is not second.version
+    first.version.params["X-TEST"] = ["1"]
+    first.version.value = "changed"
+    assert second.version.params == {}
+    assert second.version.value == "4.0"
+    assert vobject.vcard40.VCard4_0._versionTemplate.params == {}
+
+    class VCard4_1(vobject.vcard40.VCard4_0):
+        versionString = "4.1"
+
+    card = vobject.vCard4()
+    card.behavior = VCard4_1
+    card.add("fn").value = "Jane Doe"
+    assert "VERSION:4.1" in card.serialize()
+    assert vobject.vcard40.VCard4_0._versionTemplate.value == "4.0"
+
+
+def test_vcard_4_serialize_many():
+    """
+    Serializing vCards together matches serializing them one by one
+    """
+    cards = []
+    for name in ("Jane Doe", "John Doe", "Development Team"):
+        card = vobject.vCard4()
+        card.add("fn").value = name
+        cards.append(card)
+    expected = "".join(card.serialize() for card in cards)
+    assert vobject.vcard40.VCard4_0.serializeMany(cards) == expected
+
+    buf = io.StringIO()
+    assert vobject.vcard40.VCard4_0.serializeMany(cards, buf) is buf
+    assert buf.getvalue() == expected
+
+    # cards keep their own behavior, and get their own VERSION
+    card3 = vobject.vCard()
+    card3.add("fn").value = "John Doe"
+    card3.add("n").value = vobject.vcard.Name(family="Doe", given="John")
+    mixed = vobject.vcard40.VCard4_0.serializeMany([cards[0], card3])
+    assert mixed == cards[0].serialize() + card3.serialize()
+    assert "VERSION:3.0" in mixed
+    assert card3.version.value == "3.0"
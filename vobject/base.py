@@ -1125,6 +1125,18 @@ def registerBehavior(behavior, name=None, default=False, id_=None):
         __behaviorRegistry[name] = [(id_, behavior)]
 
 
+def registerBehaviors(entries):
+    """
+    Register several behaviors in one call.
+
+    entries is an iterable of (behavior, name, id_) tuples, passed on to
+    L{registerBehavior}.  None of them becomes the default for a name that
+    is already registered.
+    """
+    for behavior, name, id_ in entries:
+        registerBehavior(behavior, name, id_=id_)
+
+
 def getBehavior(name, id_=None):
     """
     Return a matching behavior if it exists, or None.
@@ -1,6 +1,41 @@
+from types import MappingProxyType
+
 from . import base
 
 
+def _childCountValidator(name, knownChildren):
+    """
+    Generate a function checking child counts against knownChildren.
+
+    The returned function takes a dictionary of uppercased child names to
+    counts and raiseException, and behaves like the loop in
+    L{Behavior.validate}: checks run in knownChildren order with the same
+    messages.  Children without a minimum or maximum emit no code at all.
+
+    Only used for read-only (MappingProxyType) tables, since the function
+    is cached and wouldn't see later edits to a mutable dictionary.
+    """
+    src = ["def validateChildCounts(count, raiseException):"]
+    for key, val in knownChildren.items():
+        checks = []
+        if val[0]:
+            checks.append(("<", val[0], f"{name} components must contain at least {val[0]} {key}"))
+        if val[1]:
+            checks.append((">", val[1], f"{name} components cannot contain more than {val[1]} {key}"))
+        if checks:
+            src.append(f"    n = count.get({key!r}, 0)")
+        for op, limit, msg in checks:
+            src.append(f"    if n {op} {limit!r}:")
+            src.append("        if raiseException:")
+            src.append(f"            raise ValidateError({msg!r})")
+            src.append("        return False")
+    src.append("    return True")
+    namespace = {"ValidateError": base.ValidateError}
+    # the source is built above from knownChildren keys and limits, all repr()'d
+    exec(compile("\n".join(src), f"<{name} child count validator>", "exec"), namespace)  # pylint: disable=exec-used
+    return namespace["validateChildCounts"]
+
+
 # ------------------------ Abstract class for behavior --------------------------
 class Behavior:
     """
@@ -44,6 +79,8 @@ class Behavior:
         Whether or not vCard style group prefixes are allowed.
     """
 
+    __slots__ = ()
+
     name = ""
     description = ""
     versionString = ""
@@ -86,7 +123,15 @@ class Behavior:
                     return False
                 name = child.name.upper()
                 count[name] = count.get(name, 0) + 1
-            for key, val in cls.knownChildren.items():
+            knownChildren = cls.knownChildren
+            if isinstance(knownChildren, MappingProxyType):
+                # read-only tables can't change under a generated validator
+                check = cls.__dict__.get("_childCountCheck")
+                if check is None or check[0] is not knownChildren:
+                    check = (knownChildren, _childCountValidator(cls.name, knownChildren))
+                    cls._childCountCheck = check
+                return check[1](count, raiseException)
+            for key, val in knownChildren.items():
                 if count.get(key, 0) < val[0]:
                     if raiseException:
                         raise base.ValidateError(f"{cls.name} components must contain at least {val[0]} {key}")
@@ -112,6 +112,8 @@ class VCardTextBehavior(behavior.Behavior):
     explicitly set to BASE64.
     """
 
+    __slots__ = ()
+
     allowGroup = True
     base64string = "B"
 
@@ -1,35 +1,60 @@
 """Definitions and behavior for vCard 4.0"""
 
-import codecs
+import copy
+import io
+from types import MappingProxyType
 
-from . import behavior
-
-from .base import ContentLine, registerBehavior, backslashEscape, str_
+from .base import ContentLine, registerBehaviors
 from .icalendar import stringToTextValues
-from .vcard import (
-    VCardBehavior,
-    VCardTextBehavior,
-    Name,
-    NameBehavior,
-    Address,
-    AddressBehavior,
-    OrgBehavior,
-    toListOrString,
-    splitFields,
-    toList,
-    serializeFields,
-    NAME_ORDER,
-    ADDRESS_ORDER,
-    REALLY_LARGE,
-    wacky_apple_photo_serialize
-)
-
-
-# Python 3 no longer has a basestring type, so....
-try:
-    basestring = basestring
-except NameError:
-    basestring = (str, bytes)
+from .vcard import REALLY_LARGE, VCardBehavior, VCardTextBehavior, wacky_apple_photo_serialize
+
+# Shared (min, max, behaviorRegistry id) values for knownChildren
+_ZERO_N = (0, None, None)  # optional, any number
+_ONE_N = (1, None, None)   # one or more, required
+_ZERO_1 = (0, 1, None)     # at most one
+_ONE_1 = (1, 1, None)      # exactly one, required
+
+# Cardinality of vCard 4.0 properties.
+# Read-only, since it's shared by every VCARD component using this behavior.
+_KNOWN_CHILDREN_4_0 = MappingProxyType({
+    'VERSION':      _ONE_1,
+    'FN':           _ONE_N,
+    'N':            _ZERO_1,
+    'NICKNAME':     _ZERO_N,
+    'PHOTO':        _ZERO_N,
+    'BDAY':         _ZERO_1,
+    'ANNIVERSARY':  _ZERO_1,  # new in 4.0
+    'GENDER':       _ZERO_1,  # new in 4.0
+    'ADR':          _ZERO_N,
+    'TEL':          _ZERO_N,
+    'EMAIL':        _ZERO_N,
+    'IMPP':         _ZERO_N,  # new in 4.0
+    'LANG':         _ZERO_N,  # new in 4.0
+    'TZ':           _ZERO_N,
+    'GEO':          _ZERO_N,
+    'TITLE':        _ZERO_N,
+    'ROLE':         _ZERO_N,
+    'LOGO':         _ZERO_N,
+    'ORG':          _ZERO_N,
+    'MEMBER':       _ZERO_N,  # new in 4.0, only for KIND=group
+    'RELATED':      _ZERO_N,  # new in 4.0
+    'CATEGORIES':   _ZERO_N,
+    'NOTE':         _ZERO_N,
+    'PRODID':       _ZERO_1,
+    'REV':          _ZERO_1,
+    'SORT-STRING':  _ZERO_N,  # deprecated in 4.0, but may exist
+    'SOUND':        _ZERO_N,
+    'UID':          _ZERO_1,
+    'CLIENTPIDMAP': _ZERO_N,  # new in 4.0
+    'URL':          _ZERO_N,
+    'KEY':          _ZERO_N,
+    'FBURL':        _ZERO_N,
+    'CALADRURI':    _ZERO_N,
+    'CALURI':       _ZERO_N,
+    'XML':          _ZERO_N,  # new in 4.0
+    'SOURCE':       _ZERO_N,  # new in 4.0
+    'KIND':         _ZERO_1,  # new in 4.0
+})
 
 
 # ------------------------ vCard 4.0 Main Component ----------------------------
@@ -43,46 +68,7 @@ class VCard4_0(VCardBehavior):
     versionString = '4.0'
     isComponent = True
     sortFirst = ('version', 'prodid', 'uid')
-    knownChildren = {
-        'VERSION':      (1, 1, None),     # exactly one, required
-        'FN':           (1, None, None),  # one or more, required
-        'N':            (0, 1, None),     # at most one
-        'NICKNAME':     (0, None, None),
-        'PHOTO':        (0, None, None),
-        'BDAY':         (0, 1, None),
-        'ANNIVERSARY':  (0, 1, None),     # new in 4.0
-        'GENDER':       (0, 1, None),     # new in 4.0
-        'ADR':          (0, None, None),
-        'TEL':          (0, None, None),
-        'EMAIL':        (0, None, None),
-        'IMPP':         (0, None, None),  # new in 4.0
-        'LANG':         (0, None, None),  # new in 4.0
-        'TZ':           (0, None, None),
-        'GEO':          (0, None, None),
-        'TITLE':        (0, None, None),
-        'ROLE':         (0, None, None),
-        'LOGO':         (0, None, None),
-        'ORG':          (0, None, None),
-        'MEMBER':       (0, None, None),  # new in 4.0, only for KIND=group
-        'RELATED':      (0, None, None),  # new in 4.0
-        'CATEGORIES':   (0, None, None),
-        'NOTE':         (0, None, None),
-        'PRODID':       (0, 1, None),
-        'REV':          (0, 1, None),
-        'SORT-STRING':  (0, None, None),  # deprecated in 4.0, but may exist
-        'SOUND':        (0, None, None),
-        'UID':          (0, 1, None),
-        'CLIENTPIDMAP': (0, None, None),  # new in 4.0
-        'URL':          (0, None, None),
-        'VERSION':      (1, 1, None),
-        'KEY':          (0, None, None),
-        'FBURL':        (0, None, None),
-        'CALADRURI':    (0, None, None),
-        'CALURI':       (0, None, None),
-        'XML':          (0, None, None),  # new in 4.0
-        'SOURCE':       (0, None, None),  # new in 4.0
-        'KIND':         (0, 1, None),     # new in 4.0
-    }
+    knownChildren = _KNOWN_CHILDREN_4_0
 
     @classmethod
     def generateImplicitParameters(cls, obj):
@@ -91,27 +77,70 @@ class VCard4_0(VCardBehavior):
 
         For vCard 4.0, VERSION must be immediately after BEGIN:VCARD.
         """
-        if not hasattr(obj, 'version'):
-            obj.add(ContentLine('VERSION', [], cls.versionString))
+        if 'version' not in obj.contents:
+            # Built once per class, and again if versionString changes
+            template = cls.__dict__.get('_versionTemplate')
+            if template is None or template.value != cls.versionString:
+                template = ContentLine('VERSION', [], cls.versionString)
+                cls._versionTemplate = template
+            # A shallow copy skips ContentLine.__init__, but each line still
+            # needs its own parameter containers
+            version = copy.copy(template)
+            version.params = {}
+            version.singletonparams = []
+            obj.add(version)
 
+    @classmethod
+    def serializeMany(cls, cards, buf=None, lineLength=75, validate=True):
+        """
+        Serialize several vCards into one buffer.
 
-registerBehavior(VCard4_0)
+        This is only a loop calling card.serialize(buf) for each card with one
+        shared StringIO, so each card is serialized, implicit parameters and
+        validation included, exactly as it would be on its own.  Write to buf
+        if it exists, otherwise return a string.
+        """
+        outbuf = buf or io.StringIO()
+        for card in cards:
+            card.serialize(outbuf, lineLength, validate)
+        return buf or outbuf.getvalue()
 
 
 # ------------------------ vCard 4.0 New Properties ----------------------------
 
-class Kind(VCardTextBehavior):
+def _text_behavior(cname, name, description, doc):
+    """
+    Create a VCardTextBehavior subclass that only sets a name and description.
+    """
+    return type(cname, (VCardTextBehavior,), {
+        '__doc__': doc,
+        '__slots__': (),
+        'name': name,
+        'description': description,
+    })
+
+
+Kind = _text_behavior(
+    'Kind', 'KIND', 'Kind of object (individual, group, org, location)',
     """
     KIND property for vCard 4.0.
 
     Valid values: individual, group, org, location, or x-name/iana-token
     Default (if not present): individual
     """
-    name = "KIND"
-    description = 'Kind of object (individual, group, org, location)'
+)
 
 
-registerBehavior(Kind)
+def _gender_decode(line):
+    """Decode the gender value."""
+    if not line.encoded:
+        return
+    # Gender is semicolon-separated: sex;text.  Both components are kept;
+    # without backslashes or commas there's nothing to unescape.
+    value = line.value
+    if '\\' in value or ',' in value:
+        line.value = stringToTextValues(value)[0]
+    line.encoded = False
 
 
 class Gender(VCardTextBehavior):
@@ -128,22 +157,15 @@ class Gender(VCardTextBehavior):
         GENDER:O;intersex
         GENDER:;it's complicated
     """
+    __slots__ = ()
     name = "GENDER"
     description = 'Sex and gender identity'
 
-    @classmethod
-    def decode(cls, line):
-        """Decode the gender value."""
-        if line.encoded:
-            # Gender is semicolon-separated: sex;text
-            line.value = stringToTextValues(line.value)[0]
-            line.encoded = False
-
+    decode = staticmethod(_gender_decode)
 
-registerBehavior(Gender)
 
-
-class Anniversary(VCardTextBehavior):
+Anniversary = _text_behavior(
+    'Anniversary', 'ANNIVERSARY', 'Date of marriage or equivalent',
     """
     ANNIVERSARY property for vCard 4.0.
 
@@ -152,14 +174,11 @@ class Anniversary(VCardTextBehavior):
         ANNIVERSARY:19960415
         ANNIVERSARY:--0415
     """
-    name = "ANNIVERSARY"
-    description = 'Date of marriage or equivalent'
-
-
-registerBehavior(Anniversary)
+)
 
 
-class Lang(VCardTextBehavior):
+Lang = _text_behavior(
+    'Lang', 'LANG', 'Language preference',
     """
     LANG property for vCard 4.0.
 
@@ -170,14 +189,11 @@ class Lang(VCardTextBehavior):
         LANG;PREF=1:en
         LANG;PREF=2:fr
     """
-    name = "LANG"
-    description = 'Language preference'
-
-
-registerBehavior(Lang)
+)
 
 
-class Impp(VCardTextBehavior):
+Impp = _text_behavior(
+    'Impp', 'IMPP', 'Instant messaging and presence protocol URI',
     """
     IMPP property for vCard 4.0.
 
@@ -188,14 +204,11 @@ class Impp(VCardTextBehavior):
         IMPP:sip:alice@example.com
         IMPP:skype:alice.example
     """
-    name = "IMPP"
-    description = 'Instant messaging and presence protocol URI'
-
-
-registerBehavior(Impp)
+)
 
 
-class Related(VCardTextBehavior):
+Related = _text_behavior(
+    'Related', 'RELATED', 'Relationship to another entity',
     """
     RELATED property for vCard 4.0.
 
@@ -207,14 +220,11 @@ class Related(VCardTextBehavior):
         RELATED;TYPE=co-worker;VALUE=text:Jane Doe
         RELATED;TYPE=spouse:http://example.com/directory/jdoe.vcf
     """
-    name = "RELATED"
-    description = 'Relationship to another entity'
-
-
-registerBehavior(Related)
+)
 
 
-class Member(VCardTextBehavior):
+Member = _text_behavior(
+    'Member', 'MEMBER', 'Group member (only for KIND=group)',
     """
     MEMBER property for vCard 4.0.
 
@@ -225,14 +235,11 @@ class Member(VCardTextBehavior):
         MEMBER:urn:uuid:03a0e51f-d1aa-4385-8a53-e29025acd8af
         MEMBER:mailto:subscriber1@example.com
     """
-    name = "MEMBER"
-    description = 'Group member (only for KIND=group)'
-
-
-registerBehavior(Member)
+)
 
 
-class ClientPidMap(VCardTextBehavior):
+ClientPidMap = _text_behavior(
+    'ClientPidMap', 'CLIENTPIDMAP', 'Client PID mapping for synchronization',
     """
     CLIENTPIDMAP property for vCard 4.0.
 
@@ -242,14 +249,11 @@ class ClientPidMap(VCardTextBehavior):
     Examples:
         CLIENTPIDMAP:1;urn:uuid:3df403f4-5924-4bb7-b077-3c711d9eb34b
     """
-    name = "CLIENTPIDMAP"
-    description = 'Client PID mapping for synchronization'
-
-
-registerBehavior(ClientPidMap)
+)
 
 
-class Xml(VCardTextBehavior):
+Xml = _text_behavior(
+    'Xml', 'XML', 'Extended XML-encoded vCard data',
     """
     XML property for vCard 4.0.
 
@@ -259,14 +263,11 @@ class Xml(VCardTextBehavior):
     Example:
         XML:<ext xmlns="http://example.com/ext">data</ext>
     """
-    name = "XML"
-    description = 'Extended XML-encoded vCard data'
-
-
-registerBehavior(Xml)
+)
 
 
-class Source(VCardTextBehavior):
+Source = _text_behavior(
+    'Source', 'SOURCE', 'Source URI for directory information',
     """
     SOURCE property for vCard 4.0.
 
@@ -276,14 +277,21 @@ class Source(VCardTextBehavior):
         SOURCE:http://example.com/directory/jdoe.vcf
         SOURCE:ldap://ldap.example.com/cn=John%20Doe,o=Example%20Corp,c=US
     """
-    name = "SOURCE"
-    description = 'Source URI for directory information'
+)
 
 
-registerBehavior(Source)
+# ------------------------ Modified Properties for vCard 4.0 -------------------
 
+def _uri_media_serialize(cls, obj, buf, lineLength, validate, *args, **kwargs):
+    """
+    Shared serialize for PHOTO and LOGO.
+
+    Apple's Address Book compatibility for images: don't wrap inline data.
+    """
+    if cls._WACKY:
+        lineLength = REALLY_LARGE
+    return VCardTextBehavior.serialize(obj, buf, lineLength, validate, *args, **kwargs)
 
-# ------------------------ Modified Properties for vCard 4.0 -------------------
 
 class Photo4_0(VCardTextBehavior):
     """
@@ -296,24 +304,16 @@ class Photo4_0(VCardTextBehavior):
         PHOTO:http://example.com/photo.jpg
         PHOTO;MEDIATYPE=image/jpeg:data:image/jpeg;base64,MIICajCCA...
     """
+    __slots__ = ()
     name = "Photo"
     description = 'Photograph (URI or data URI in vCard 4.0)'
+    _WACKY = wacky_apple_photo_serialize  # read once, at class creation
 
     @classmethod
     def valueRepr(cls, line):
-        return " (PHOTO URI at 0x{0!s}) ".format(id(line.value))
-
-    @classmethod
-    def serialize(cls, obj, buf, lineLength, validate):
-        """
-        Apple's Address Book compatibility for images.
-        """
-        if wacky_apple_photo_serialize:
-            lineLength = REALLY_LARGE
-        VCardTextBehavior.serialize(obj, buf, lineLength, validate)
+        return f" (PHOTO URI at 0x{id(line.value):x}) "
 
-
-registerBehavior(Photo4_0, 'PHOTO', id_='4.0')
+    serialize = classmethod(_uri_media_serialize)
 
 
 class Logo4_0(VCardTextBehavior):
@@ -326,24 +326,16 @@ class Logo4_0(VCardTextBehavior):
         LOGO:http://example.com/logo.png
         LOGO;MEDIATYPE=image/png:data:image/png;base64,iVBORw0KG...
     """
+    __slots__ = ()
     name = "Logo"
     description = 'Logo (URI or data URI in vCard 4.0)'
+    _WACKY = wacky_apple_photo_serialize  # read once, at class creation
 
     @classmethod
     def valueRepr(cls, line):
-        return " (LOGO URI at 0x{0!s}) ".format(id(line.value))
-
-    @classmethod
-    def serialize(cls, obj, buf, lineLength, validate):
-        """
-        Handle logo serialization similarly to photos.
-        """
-        if wacky_apple_photo_serialize:
-            lineLength = REALLY_LARGE
-        VCardTextBehavior.serialize(obj, buf, lineLength, validate)
-
+        return f" (LOGO URI at 0x{id(line.value):x}) "
 
-registerBehavior(Logo4_0, 'LOGO', id_='4.0')
+    serialize = classmethod(_uri_media_serialize)
 
 
 class Sound4_0(VCardTextBehavior):
@@ -356,18 +348,17 @@ class Sound4_0(VCardTextBehavior):
         SOUND:http://example.com/sound.ogg
         SOUND;MEDIATYPE=audio/ogg:data:audio/ogg;base64,T2dnUw...
     """
+    __slots__ = ()
     name = "Sound"
     description = 'Sound (URI or data URI in vCard 4.0)'
 
     @classmethod
     def valueRepr(cls, line):
-        return " (SOUND URI at 0x{0!s}) ".format(id(line.value))
+        return f" (SOUND URI at 0x{id(line.value):x}) "
 
 
-registerBehavior(Sound4_0, 'SOUND', id_='4.0')
-
-
-class Geo4_0(VCardTextBehavior):
+Geo4_0 = _text_behavior(
+    'Geo4_0', 'Geo', 'Geographic position (geo: URI in vCard 4.0)',
     """
     GEO property for vCard 4.0.
 
@@ -378,14 +369,11 @@ class Geo4_0(VCardTextBehavior):
         GEO:geo:37.386013,-122.082932
         GEO:geo:48.198634,16.371648;crs=wgs84;u=40
     """
-    name = "Geo"
-    description = 'Geographic position (geo: URI in vCard 4.0)'
-
-
-registerBehavior(Geo4_0, 'GEO', id_='4.0')
+)
 
 
-class Key4_0(VCardTextBehavior):
+Key4_0 = _text_behavior(
+    'Key4_0', 'Key', 'Public key or authentication certificate (URI or text in vCard 4.0)',
     """
     KEY property for vCard 4.0.
 
@@ -397,14 +385,11 @@ class Key4_0(VCardTextBehavior):
         KEY;MEDIATYPE=application/pgp-keys:data:application/pgp-keys;base64,LS0t...
         KEY:data:application/pgp-keys;base64,LS0t...
     """
-    name = "Key"
-    description = 'Public key or authentication certificate (URI or text in vCard 4.0)'
-
-
-registerBehavior(Key4_0, 'KEY', id_='4.0')
+)
 
 
-class Tel4_0(VCardTextBehavior):
+Tel4_0 = _text_behavior(
+    'Tel4_0', 'Tel', 'Telephone number (preferably tel: URI in vCard 4.0)',
     """
     TEL property for vCard 4.0.
 
@@ -420,14 +405,11 @@ class Tel4_0(VCardTextBehavior):
         TEL;TYPE=cell:tel:+1-555-123-4567
         TEL;VALUE=text:+1-555-555-5555
     """
-    name = "Tel"
-    description = 'Telephone number (preferably tel: URI in vCard 4.0)'
-
-
-registerBehavior(Tel4_0, 'TEL', id_='4.0')
+)
 
 
-class Uid4_0(VCardTextBehavior):
+Uid4_0 = _text_behavior(
+    'Uid4_0', 'Uid', 'Unique identifier (preferably URI in vCard 4.0)',
     """
     UID property for vCard 4.0.
 
@@ -438,16 +420,13 @@ class Uid4_0(VCardTextBehavior):
         UID:urn:uuid:f81d4fae-7dec-11d0-a765-00a0c91e6bf6
         UID:http://example.com/contacts/jdoe
     """
-    name = "Uid"
-    description = 'Unique identifier (preferably URI in vCard 4.0)'
-
-
-registerBehavior(Uid4_0, 'UID', id_='4.0')
+)
 
 
 # ------------------------ vCard 4.0 FN with updated cardinality ----------------
 
-class FN4_0(VCardTextBehavior):
+FN4_0 = _text_behavior(
+    'FN4_0', 'FN', 'Formatted name (one or more required in vCard 4.0)',
     """
     FN property for vCard 4.0.
 
@@ -459,8 +438,33 @@ class FN4_0(VCardTextBehavior):
         FN;LANGUAGE=en:John Doe
         FN;LANGUAGE=jp:ジョン・ドゥ
     """
-    name = "FN"
-    description = 'Formatted name (one or more required in vCard 4.0)'
+)
 
 
-registerBehavior(FN4_0, 'FN', id_='4.0')
+# ------------------------ Registration ----------------------------------------
+
+# (behavior, name, id_) as passed to registerBehavior; a name of None means
+# behavior.name, an id_ of None means behavior.versionString
+_REGISTRATIONS = (
+    (VCard4_0, None, None),
+    (Kind, None, None),
+    (Gender, None, None),
+    (Anniversary, None, None),
+    (Lang, None, None),
+    (Impp, None, None),
+    (Related, None, None),
+    (Member, None, None),
+    (ClientPidMap, None, None),
+    (Xml, None, None),
+    (Source, None, None),
+    (Photo4_0, 'PHOTO', '4.0'),
+    (Logo4_0, 'LOGO', '4.0'),
+    (Sound4_0, 'SOUND', '4.0'),
+    (Geo4_0, 'GEO', '4.0'),
+    (Key4_0, 'KEY', '4.0'),
+    (Tel4_0, 'TEL', '4.0'),
+    (Uid4_0, 'UID', '4.0'),
+    (FN4_0, 'FN', '4.0'),
+)
+
+registerBehaviors(_REGISTRATIONS)